@@ -1,21 +1,162 @@
 import sys
+import re
 import sqlite3
 import time
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QDialog, QVBoxLayout, 
-                             QHBoxLayout, QLabel, QLineEdit, QTextEdit, QMessageBox, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QWidget, QAbstractItemView,
+                             QHBoxLayout, QLabel, QLineEdit, QTextEdit, QMessageBox, QTableView,
+                             QHeaderView, QWidget, QAbstractItemView,
                              QCheckBox, QSplashScreen, QStyleFactory, 
-                             QComboBox, QFileDialog)
-from PyQt5.QtCore import Qt, QTimer, QRect
-from PyQt5.QtGui import QFont, QIcon, QKeySequence, QPixmap, QLinearGradient, QColor
+                             QComboBox, QFileDialog, QStyledItemDelegate, QStyle,
+                             QStyleOptionButton)
+from PyQt5.QtCore import (Qt, QTimer, QRect, QObject, QRunnable, QThreadPool, pyqtSignal,
+                          QAbstractTableModel, QModelIndex, QEvent)
+from PyQt5.QtGui import QFont, QIcon, QKeySequence, QPixmap, QLinearGradient, QColor, QPainter
+
+# 按钮样式表：在QApplication上统一设置一次，按钮通过objectName选择样式
+BUTTON_STYLE_SHEET = """
+QPushButton#primaryButton, QPushButton#dangerButton,
+QPushButton#infoButton, QPushButton#warningButton {
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton#primaryButton { background-color: #4CAF50; }
+QPushButton#primaryButton:hover { background-color: #45a049; }
+QPushButton#dangerButton { background-color: #f44336; }
+QPushButton#dangerButton:hover { background-color: #d32f2f; }
+QPushButton#infoButton { background-color: #2196F3; }
+QPushButton#infoButton:hover { background-color: #1976D2; }
+QPushButton#warningButton { background-color: #FF9800; }
+QPushButton#warningButton:hover { background-color: #F57C00; }
+QPushButton#reloadButton {
+    background-color: #17a2b8;
+    color: white;
+    border: none;
+    padding: 6px 12px;
+    border-radius: 3px;
+    font-weight: bold;
+}
+QPushButton#reloadButton:hover { background-color: #138496; }
+"""
+
+# 时间格式 YYYY-MM-DD HH:MM:SS 的快速预检查
+DATE_PATTERN = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}')
+
+def is_valid_datetime(date_str):
+    """检查时间字符串是否为有效的 YYYY-MM-DD HH:MM:SS 格式"""
+    # 格式不符的输入直接由正则排除，只有格式正确时才用strptime检查日期是否真实存在
+    if not DATE_PATTERN.fullmatch(date_str):
+        return False
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return False
+    return True
+
+# SQLite内置的lower()只转换ASCII字母
+ASCII_LOWER_TABLE = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def sqlite_lower(name):
+    """与SQLite的lower()结果一致的小写转换，用作名字的查重键"""
+    return name.translate(ASCII_LOWER_TABLE)
 
 class DatabaseManager:
-    def __init__(self, db_path=None):
+    # 最多同时保持打开的数据库连接数
+    MAX_CONNECTIONS = 4
+    # 每条IN查询中的参数个数上限
+    IN_CHUNK_SIZE = 500
+    
+    # 数据库结构版本（PRAGMA user_version），1 表示旧格式的日期已统一补零
+    SCHEMA_VERSION = 1
+    # 符合 YYYY-MM-DD HH:MM:SS 格式的日期，只有这样的日期能按文本正确排序、被strftime解析
+    DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]"
+    
+    # 热点SQL：每次使用完全相同的语句文本，才能命中连接的语句缓存
+    RECORD_COLUMNS = "id, name, add_date, remark, CAST(strftime('%s', add_date) AS INTEGER) AS ts"
+    INSERT_SQL = "INSERT INTO records (name, add_date, remark) VALUES (?, ?, ?)"
+    INSERT_OR_IGNORE_SQL = "INSERT OR IGNORE INTO records (name, add_date, remark) VALUES (?, ?, ?)"
+    # 表格各列对应的排序字段（第0列复选框没有对应字段）；{order} 由 order_by() 生成
+    SORT_FIELDS = {1: "id", 2: "name", 3: "add_date", 4: "remark"}
+    PAGE_SQL = f"""
+        SELECT {RECORD_COLUMNS} 
+        FROM records 
+        {{order}} 
+        LIMIT ? OFFSET ?
+        """
+    COUNT_SQL = "SELECT COUNT(*) FROM records"
+    # 搜索结果与列表一样分页返回（LIMIT -1 表示不限条数）
+    # 以前缀开头的名字都落在 [前缀, 前缀 + 最大字符) 区间内
+    PREFIX_WHERE = "lower(name) >= lower(?1) AND lower(name) < lower(?1) || char(1114111)"
+    PREFIX_SEARCH_SQL = f"""
+        SELECT {RECORD_COLUMNS} 
+        FROM records 
+        WHERE {PREFIX_WHERE} 
+        {{order}} 
+        LIMIT ?2 OFFSET ?3
+        """
+    PREFIX_COUNT_SQL = f"SELECT COUNT(*) FROM records WHERE {PREFIX_WHERE}"
+    FTS_SEARCH_SQL = """
+        SELECT r.id, r.name, r.add_date, r.remark, CAST(strftime('%s', r.add_date) AS INTEGER) AS ts 
+        FROM records_fts 
+        JOIN records r ON r.id = records_fts.rowid 
+        WHERE records_fts MATCH ? 
+        {order} 
+        LIMIT ? OFFSET ?
+        """
+    FTS_COUNT_SQL = "SELECT COUNT(*) FROM records_fts WHERE records_fts MATCH ?"
+    LIKE_SEARCH_SQL = f"""
+        SELECT {RECORD_COLUMNS} 
+        FROM records 
+        WHERE name LIKE ? 
+        {{order}} 
+        LIMIT ? OFFSET ?
+        """
+    LIKE_COUNT_SQL = "SELECT COUNT(*) FROM records WHERE name LIKE ?"
+    
+    def __init__(self, db_path=None, create_schema=True):
+        """create_schema 为False时不创建表结构（由其他连接负责），也不会立即打开连接"""
         self.db_path = db_path or 'movies.db'
-        self.conn = sqlite3.connect(self.db_path)
-        self.create_table()
+        # 按数据库路径缓存已打开的连接（LRU），切换回来时无需重新打开、页缓存仍然有效
+        self.connections = OrderedDict()
+        self.fts_enabled = False
+        if create_schema:
+            self.create_table()
+    
+    @property
+    def conn(self):
+        """当前数据库的连接，首次使用时打开"""
+        key = os.path.abspath(self.db_path)
+        conn = self.connections.get(key)
+        if conn is None:
+            conn = self.open_connection(self.db_path)
+            self.connections[key] = conn
+            # 超出上限时关闭最久未使用的连接
+            while len(self.connections) > self.MAX_CONNECTIONS:
+                _, oldest = self.connections.popitem(last=False)
+                oldest.close()
+        else:
+            self.connections.move_to_end(key)
+        return conn
+    
+    @staticmethod
+    def open_connection(db_path):
+        """打开数据库连接并设置性能相关参数"""
+        # 放大语句缓存，热点SQL只需编译一次
+        conn = sqlite3.connect(db_path, cached_statements=256)
+        # 查询结果既可按下标也可按列名访问
+        conn.row_factory = sqlite3.Row
+        # WAL日志 + NORMAL同步级别，减少每次提交的fsync次数
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
     
     def create_table(self):
         """创建数据库表结构（如果不存在）"""
@@ -29,46 +170,221 @@ class DatabaseManager:
         """
         self.conn.execute(query)
         
-        # 创建不区分大小写的唯一索引
+        # 创建不区分大小写的唯一索引：索引 lower(name) 本身，比较时是普通的二进制比较，
+        # 无需在每次比较时按NOCASE规则转换
+        self.conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_name_lower 
+        ON records (lower(name))
+        """)
+        # 旧版本使用的NOCASE索引与上面的索引约束相同，删除以免每次写入维护两份索引
+        self.conn.execute("DROP INDEX IF EXISTS idx_name_unique")
+        
+        # 按添加日期降序的索引（id作为同一时间的次序），列表查询可直接按索引顺序读取，无需额外排序
         self.conn.execute("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_name_unique 
-        ON records (name COLLATE NOCASE)
+        CREATE INDEX IF NOT EXISTS idx_records_add_date 
+        ON records (add_date DESC, id DESC)
         """)
+        
+        # 名称全文索引，用于加速包含式搜索
+        self.fts_enabled = self.create_fts_index()
+        
+        # 旧版本允许写入未补零的日期，只需统一一次
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self.normalize_dates()
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
         self.conn.commit()
     
+    def normalize_dates(self):
+        """把未补零的日期（如 2024-1-5 8:00:00）改写为 YYYY-MM-DD HH:MM:SS（不提交事务）"""
+        cursor = self.conn.execute(
+            "SELECT id, add_date FROM records WHERE add_date NOT GLOB ?", (self.DATE_GLOB,))
+        updates = []
+        for record_id, add_date in cursor.fetchall():
+            try:
+                value = datetime.strptime(str(add_date).strip(), "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                continue  # 无法解析的日期保持原样
+            updates.append((value.strftime("%Y-%m-%d %H:%M:%S"), record_id))
+        if updates:
+            self.conn.executemany("UPDATE records SET add_date = ? WHERE id = ?", updates)
+    
+    def has_fts_index(self):
+        """当前数据库中是否已有FTS5全文索引"""
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'records_fts'"
+        ).fetchone() is not None
+    
+    def create_fts_index(self):
+        """创建与records表同步的FTS5全文索引，SQLite不支持时返回False"""
+        exists = self.has_fts_index()
+        
+        try:
+            # trigram分词支持任意子串匹配（包括中文），与原来的 LIKE '%q%' 语义一致
+            self.conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+                name, content='records', content_rowid='id', tokenize='trigram'
+            )
+            """)
+        except sqlite3.OperationalError:
+            # 当前SQLite未编译FTS5或不支持trigram分词，退回LIKE搜索
+            return False
+        
+        # 通过触发器保持全文索引与records表同步
+        self.conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN
+            INSERT INTO records_fts (rowid, name) VALUES (new.id, new.name);
+        END
+        """)
+        self.conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN
+            INSERT INTO records_fts (records_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+        """)
+        self.conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE ON records BEGIN
+            INSERT INTO records_fts (records_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO records_fts (rowid, name) VALUES (new.id, new.name);
+        END
+        """)
+        
+        # 已有数据库首次建立索引时，导入现有记录
+        if not exists:
+            self.conn.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+        return True
+    
     def add_record(self, name, add_date, remark=None):
         try:
-            query = "INSERT INTO records (name, add_date, remark) VALUES (?, ?, ?)"
-            self.conn.execute(query, (name.strip(), add_date, remark))
+            self.conn.execute(self.INSERT_SQL, (name.strip(), add_date, remark))
             self.conn.commit()
             return True, None
         except sqlite3.IntegrityError:
             # 捕获重复名称错误
+            self.conn.rollback()
             duplicate = self.find_duplicate(name)
             return False, duplicate
     
+    def add_records_bulk(self, records):
+        """在单个事务中批量添加记录，返回 (成功数量, 重复名字列表)"""
+        rows = [(name.strip(), add_date, remark) for name, add_date, remark in records]
+        if not rows:
+            return 0, []
+        
+        # 先用一次批量查询找出已存在的名字，连同本批次内部的重复一起剔除
+        seen = {sqlite_lower(name) for name in self.find_existing([row[0] for row in rows])}
+        failed_names = []
+        new_rows = []
+        for row in rows:
+            key = sqlite_lower(row[0])
+            if key in seen:
+                failed_names.append(row[0])
+            else:
+                seen.add(key)
+                new_rows.append(row)
+        if not new_rows:
+            return 0, failed_names
+        rows = new_rows
+        
+        # 重复名字由唯一索引忽略，按实际插入的行数判断是否全部成功
+        query = self.INSERT_OR_IGNORE_SQL
+        self.conn.execute("BEGIN")
+        if self.conn.executemany(query, rows).rowcount == len(rows):
+            self.conn.commit()
+            return len(rows), failed_names
+        
+        # 检查后又出现了重复名称（例如其他程序同时写入）：回滚后逐条插入以找出重复项
+        self.conn.rollback()
+        success_count = 0
+        self.conn.execute("BEGIN")
+        for row in rows:
+            if self.conn.execute(query, row).rowcount:
+                success_count += 1
+            else:
+                failed_names.append(row[0])
+        self.conn.commit()
+        return success_count, failed_names
+    
+    def find_existing(self, names):
+        """批量检查名字是否已存在（不区分大小写），返回数据库中已存在的名字列表"""
+        keys = [sqlite_lower(name.strip()) for name in names]
+        existing = []
+        # 分批查询，避免超出SQLite的参数个数限制
+        for start in range(0, len(keys), self.IN_CHUNK_SIZE):
+            chunk = keys[start:start + self.IN_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            query = f"SELECT name FROM records WHERE lower(name) IN ({placeholders})"
+            cursor = self.conn.execute(query, chunk)
+            existing.extend(row[0] for row in cursor)
+        return existing
+    
     def find_duplicate(self, name):
         """检查名称是否已存在，存在则返回记录详情，否则返回None"""
-        query = "SELECT add_date, remark FROM records WHERE name = ? COLLATE NOCASE LIMIT 1"
+        query = "SELECT add_date, remark FROM records WHERE lower(name) = lower(?) LIMIT 1"
         cursor = self.conn.execute(query, (name.strip(),))
         result = cursor.fetchone()
         return result if result else None
     
     def get_all_records(self):
-        query = "SELECT id, name, add_date, remark FROM records ORDER BY add_date DESC"
+        query = f"SELECT {self.RECORD_COLUMNS} FROM records ORDER BY add_date DESC"
         cursor = self.conn.execute(query)
         return cursor.fetchall()
     
-    def search_records(self, name_query):
-        query = """
-        SELECT id, name, add_date, remark 
-        FROM records 
-        WHERE name LIKE ? COLLATE NOCASE 
-        ORDER BY add_date DESC
-        """
-        cursor = self.conn.execute(query, (f'%{name_query}%',))
+    @classmethod
+    def order_by(cls, sort_column=3, descending=True, table=""):
+        """生成按表格第 sort_column 列排序的 ORDER BY 子句，id 作为相同值的次序，保证分页稳定"""
+        direction = "DESC" if descending else "ASC"
+        field = cls.SORT_FIELDS[sort_column]
+        if field == "id":
+            return f"ORDER BY {table}id {direction}"
+        return f"ORDER BY {table}{field} {direction}, {table}id {direction}"
+    
+    def get_records_page(self, offset, limit, sort_column=3, descending=True):
+        """分页获取记录（默认按添加日期降序）"""
+        query = self.PAGE_SQL.format(order=self.order_by(sort_column, descending))
+        cursor = self.conn.execute(query, (limit, offset))
+        return cursor.fetchall()
+    
+    def count_records(self):
+        """获取记录总数"""
+        cursor = self.conn.execute(self.COUNT_SQL)
+        return cursor.fetchone()[0]
+    
+    def search_prefix(self, name_query, limit=-1, offset=0, sort_column=3, descending=True):
+        """按名称前缀搜索，在 idx_name_lower 索引上进行范围查找"""
+        query = self.PREFIX_SEARCH_SQL.format(order=self.order_by(sort_column, descending))
+        cursor = self.conn.execute(query, (name_query, limit, offset))
         return cursor.fetchall()
     
+    def count_prefix(self, name_query):
+        """按名称前缀搜索到的记录总数"""
+        return self.conn.execute(self.PREFIX_COUNT_SQL, (name_query,)).fetchone()[0]
+    
+    def use_fts(self, name_query):
+        # trigram索引至少需要3个字符，更短的查询仍使用LIKE
+        return self.fts_enabled and len(name_query) >= 3
+    
+    @staticmethod
+    def fts_phrase(name_query):
+        # 作为短语整体匹配，避免用户输入被解析为FTS查询语法
+        return '"' + name_query.replace('"', '""') + '"'
+    
+    def search_contains(self, name_query, limit=-1, offset=0, sort_column=3, descending=True):
+        """按名称包含关系搜索"""
+        if self.use_fts(name_query):
+            query = self.FTS_SEARCH_SQL.format(order=self.order_by(sort_column, descending, "r."))
+            cursor = self.conn.execute(query, (self.fts_phrase(name_query), limit, offset))
+        else:
+            query = self.LIKE_SEARCH_SQL.format(order=self.order_by(sort_column, descending))
+            cursor = self.conn.execute(query, (f'%{name_query}%', limit, offset))
+        return cursor.fetchall()
+    
+    def count_contains(self, name_query):
+        """按名称包含关系搜索到的记录总数"""
+        if self.use_fts(name_query):
+            cursor = self.conn.execute(self.FTS_COUNT_SQL, (self.fts_phrase(name_query),))
+        else:
+            cursor = self.conn.execute(self.LIKE_COUNT_SQL, (f'%{name_query}%',))
+        return cursor.fetchone()[0]
+    
     def delete_records(self, record_ids):
         if not record_ids:
             return False
@@ -81,6 +397,7 @@ class DatabaseManager:
             self.conn.commit()
             return True
         except Exception as e:
+            self.conn.rollback()
             print(f"删除错误: {e}")
             return False
     
@@ -98,19 +415,51 @@ class DatabaseManager:
             return True
         except sqlite3.IntegrityError:
             # 捕获重复名称错误
+            self.conn.rollback()
             return False
         except Exception as e:
+            self.conn.rollback()
             print(f"更新错误: {e}")
             return False
 
+    def import_from(self, other_path):
+        """把另一个数据库中的记录导入当前数据库，名称重复的记录会被跳过，返回导入的数量"""
+        # 通过ATTACH在SQLite内部完成复制，记录无需经过Python
+        self.conn.execute("ATTACH DATABASE ? AS src", (other_path,))
+        try:
+            self.conn.execute("BEGIN")
+            cursor = self.conn.execute("""
+            INSERT OR IGNORE INTO records (name, add_date, remark) 
+            SELECT name, add_date, remark FROM src.records 
+            ORDER BY add_date
+            """)
+            imported = cursor.rowcount
+            # 导入的数据库可能来自旧版本，其中的日期同样需要补零
+            if imported:
+                self.normalize_dates()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute("DETACH DATABASE src")
+        return imported
+
     def close(self):
-        self.conn.close()
+        """关闭所有已打开的连接"""
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
+    
+    def release(self, db_path):
+        """关闭指定数据库的缓存连接（覆盖或删除该文件前调用，否则文件仍被占用）"""
+        conn = self.connections.pop(os.path.abspath(db_path), None)
+        if conn is not None:
+            conn.close()
 
     def switch_database(self, new_db_path):
-        """切换到新数据库"""
-        self.close()  # 关闭当前连接
+        """切换到新数据库（之前打开过的连接会被复用）"""
         self.db_path = new_db_path
-        self.conn = sqlite3.connect(self.db_path)
         # 确保表结构存在
         self.create_table()
         
@@ -129,6 +478,328 @@ class DatabaseManager:
             print(f"创建数据库错误: {e}")
             return False
 
+class DatabaseTaskSignals(QObject):
+    """后台数据库任务的结果信号"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class DatabaseTask(QRunnable):
+    """在 DatabaseWorker 中执行的数据库任务
+    
+    执行 func(db_manager) 后通过信号把结果交回GUI线程。db_path 为None时使用工作线程当前的数据库。
+    """
+    def __init__(self, worker, db_path, func):
+        super().__init__()
+        self.worker = worker
+        self.db_path = db_path
+        self.func = func
+        self.signals = DatabaseTaskSignals()
+    
+    def run(self):
+        try:
+            db = self.worker.database(self.db_path)
+            try:
+                result = self.func(db)
+            except Exception:
+                # 不把未完成的事务留给下一个任务
+                if db.connections and db.conn.in_transaction:
+                    db.conn.rollback()
+                raise
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+class DatabaseWorker(QThreadPool):
+    """执行数据库任务的常驻后台线程
+    
+    SQLite连接不能跨线程使用。这里只有一个线程，且空闲时不会退出，
+    因此其中的 DatabaseManager 及其连接（语句缓存、页缓存）可以在各个任务之间复用。
+    表结构由GUI线程的 DatabaseManager 创建，这里不再重复。
+    注意 waitForDone() 会结束线程池的线程，之后的任务在新线程中重新打开连接。
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMaxThreadCount(1)
+        self.setExpiryTimeout(-1)
+        # 连接在第一次使用时才打开，因此会在工作线程中创建；以下属性只在工作线程中访问
+        self.db = DatabaseManager(create_schema=False)
+        self.current_path = None
+        self.thread_id = None
+    
+    def database(self, db_path):
+        """返回指向 db_path 的 DatabaseManager（在工作线程中调用）"""
+        thread_id = threading.get_ident()
+        if thread_id != self.thread_id:
+            # 工作线程被重建过，原线程打开的连接不能在这里使用（也不能在这里关闭），直接丢弃
+            self.db.connections = OrderedDict()
+            self.current_path = None
+            self.thread_id = thread_id
+        if db_path is not None and db_path != self.current_path:
+            self.db.db_path = db_path
+            self.db.fts_enabled = self.db.has_fts_index()
+            self.current_path = db_path
+        return self.db
+    
+    def release(self, db_path):
+        """关闭工作线程中指定数据库的连接，等待完成后返回"""
+        done = threading.Event()
+        
+        def release(db):
+            try:
+                db.release(db_path)
+                if self.current_path is not None and \
+                        os.path.abspath(self.current_path) == os.path.abspath(db_path):
+                    self.current_path = None  # 文件将被重建，重新检查FTS索引
+            finally:
+                done.set()
+        
+        # 用事件等待而不是 waitForDone()，以免结束工作线程
+        self.start(DatabaseTask(self, None, release))
+        done.wait()
+    
+    def close(self):
+        """等待所有任务完成并关闭工作线程中的连接"""
+        self.start(DatabaseTask(self, None, lambda db: db.close()))
+        self.waitForDone()
+
+class QueryCache:
+    """查询结果缓存，按 (数据库路径, 查询内容) 保存最近使用的结果
+    
+    数据库内容发生变化时需调用 clear()。每次清空都会增加版本号，
+    清空之前发起、之后才返回的查询结果按版本号丢弃，不会被存入缓存。
+    """
+    MAX_ENTRIES = 32
+    
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.version = 0
+    
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+    
+    def put(self, key, result, version):
+        if version != self.version:
+            return  # 查询期间缓存已失效
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.MAX_ENTRIES:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+        self.version += 1
+
+class RecordsModel(QAbstractTableModel):
+    """记录表格的数据模型
+    
+    直接保存数据库返回的记录元组，视图只会为可见的单元格调用 data()，
+    不需要为每条记录创建表格项或控件。第0列的复选状态保存在一个bytearray中。
+    """
+    HEADERS = ["选择", "ID", "名字", "添加日期", "备注"]
+    
+    # 视图滚动到底部且还有未加载的记录时发出
+    fetch_more_requested = pyqtSignal()
+    # 点击表头要求按其他列或顺序排序时发出 (列, 顺序)；记录分页加载，排序由数据库查询完成
+    sort_requested = pyqtSignal(int, Qt.SortOrder)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.checked = bytearray()
+        self.checked_total = 0  # 已勾选的数量，随勾选状态的变化同步维护
+        self.pending_checked = set()  # 已勾选但尚未加载到表格中的记录ID（全选时产生）
+        self.row_by_id = None  # 记录ID到行号的映射，行变化后置空，需要时再重建
+        self.has_more = False
+        # 当前记录的排序方式，默认与查询的默认顺序（添加日期降序）一致
+        self.sort_column = 3
+        self.sort_order = Qt.DescendingOrder
+    
+    def set_records(self, records):
+        """替换全部记录（复选状态清空），记录应已按当前的排序方式排好序"""
+        self.beginResetModel()
+        self.records = list(records)
+        self.checked = bytearray(len(self.records))
+        self.checked_total = 0
+        self.pending_checked = set()
+        self.row_by_id = None
+        self.endResetModel()
+    
+    def append_records(self, records):
+        """在末尾追加记录"""
+        if not records:
+            return
+        first = len(self.records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.records.extend(records)
+        self.checked.extend(bytearray(len(records)))
+        # 全选时已勾选、现在才加载到的记录
+        if self.pending_checked:
+            for row in range(first, len(self.records)):
+                record_id = self.records[row][0]
+                if record_id in self.pending_checked:
+                    self.pending_checked.discard(record_id)
+                    self.checked[row] = 1
+                    self.checked_total += 1
+        self.row_by_id = None
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        
+        # 第0列：复选框
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self.checked[row] else Qt.Unchecked
+            return None
+        
+        # 第1~4列：ID、名字、添加日期、备注
+        if role == Qt.DisplayRole:
+            value = self.records[row][column - 1]
+            return "" if value is None else value
+        # 添加日期列：由SQL预先算好的时间戳，供排序使用
+        if role == Qt.UserRole and column == 3:
+            return self.records[row]["ts"]
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if index.isValid() and index.column() == 0 and role == Qt.CheckStateRole:
+            new_value = 1 if value == Qt.Checked else 0
+            self.checked_total += new_value - self.checked[index.row()]
+            self.checked[index.row()] = new_value
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+        return False
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        """按列排序（视图调用）
+        
+        已加载的只是当前结果的前几页，只对它们排序是不对的，因此交给 sort_requested
+        的接收方按新的排序方式从头重新查询；已经是该顺序时不做任何事。
+        """
+        if column == self.sort_column and order == self.sort_order:
+            return
+        self.sort_requested.emit(column, order)
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        # 请求处理完成前不再重复请求
+        self.has_more = False
+        self.fetch_more_requested.emit()
+    
+    def set_all_checked(self, checked, all_ids=()):
+        """勾选或取消勾选全部记录，只发出一次 dataChanged 信号
+        
+        all_ids 为当前结果中全部记录的ID（包括尚未加载的），勾选时一并记下，
+        之后加载到的这些记录显示为已勾选。
+        """
+        self.pending_checked = set()
+        if not self.records:
+            return
+        self.checked = bytearray([1 if checked else 0]) * len(self.records)
+        self.checked_total = len(self.records) if checked else 0
+        if checked and all_ids:
+            loaded_ids = {record[0] for record in self.records}
+            self.pending_checked = {record_id for record_id in all_ids if record_id not in loaded_ids}
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self.records) - 1, 0),
+                              [Qt.CheckStateRole])
+    
+    def set_checked_ids(self, record_ids):
+        """只勾选指定ID的记录（尚未加载的记录在加载后显示为已勾选），只发出一次 dataChanged 信号"""
+        record_ids = set(record_ids)
+        self.checked = bytearray(1 if record[0] in record_ids else 0 for record in self.records)
+        self.checked_total = self.checked.count(1)
+        self.pending_checked = record_ids - {record[0] for record in self.records}
+        if self.records:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.records) - 1, 0),
+                                  [Qt.CheckStateRole])
+    
+    def row_of(self, record_id):
+        """返回指定ID的记录所在行号，不在当前列表中时返回None"""
+        if self.row_by_id is None:
+            self.row_by_id = {record[0]: row for row, record in enumerate(self.records)}
+        return self.row_by_id.get(record_id)
+    
+    def checked_ids(self):
+        """返回所有已勾选记录的ID（包括已勾选但尚未加载的）"""
+        ids = [record[0] for record, checked in zip(self.records, self.checked) if checked]
+        ids.extend(self.pending_checked)
+        return ids
+    
+    def checked_count(self):
+        """返回已勾选的记录数量（包括已勾选但尚未加载的）"""
+        return self.checked_total + len(self.pending_checked)
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    """在单元格中居中绘制复选框，复选状态来自模型的 Qt.CheckStateRole"""
+    def paint(self, painter, option, index):
+        # 先绘制单元格背景（包括选中行的高亮）
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        
+        checkbox = QStyleOptionButton()
+        checkbox.state = QStyle.State_Enabled
+        if index.data(Qt.CheckStateRole) == Qt.Checked:
+            checkbox.state |= QStyle.State_On
+        else:
+            checkbox.state |= QStyle.State_Off
+        checkbox.rect = self.checkbox_rect(option)
+        style.drawControl(QStyle.CE_CheckBox, checkbox, painter, option.widget)
+    
+    def editorEvent(self, event, model, option, index):
+        """点击单元格或按空格键时切换复选状态"""
+        if not (index.flags() & Qt.ItemIsUserCheckable):
+            return False
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton or not option.rect.contains(event.pos()):
+                return False
+        elif event.type() == QEvent.MouseButtonDblClick:
+            return True  # 双击不重复切换
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+        
+        state = Qt.Unchecked if index.data(Qt.CheckStateRole) == Qt.Checked else Qt.Checked
+        return model.setData(index, state, Qt.CheckStateRole)
+    
+    def checkbox_rect(self, option):
+        """复选框在单元格中居中的位置"""
+        style = option.widget.style() if option.widget else QApplication.style()
+        size = style.subElementRect(QStyle.SE_CheckBoxIndicator, QStyleOptionButton(), option.widget).size()
+        rect = QRect(0, 0, size.width(), size.height())
+        rect.moveCenter(option.rect.center())
+        return rect
+
 class CustomSplashScreen(QSplashScreen):
     def __init__(self):
         # 创建一张空的图片
@@ -142,9 +813,18 @@ class CustomSplashScreen(QSplashScreen):
         self.app_title = "记录管理系统"
         self.loading_info = "正在初始化程序..."
         self.progress = 0  # 添加进度属性
+        self.last_repaint = 0.0  # 上次重绘的时间，用于限制重绘频率
+        
+        # 静态部分只绘制一次，更新进度时直接复用
+        self.background = self.render_background()
     
-    def drawContents(self, painter):
-        """自定义绘制启动画面内容"""
+    def render_background(self):
+        """绘制启动画面中不随进度变化的部分（背景、标题、logo、版权和设计者信息）"""
+        ratio = self.devicePixelRatioF()
+        background = QPixmap(self.size() * ratio)
+        background.setDevicePixelRatio(ratio)
+        painter = QPainter(background)
+        
         # 绘制背景（渐变效果）
         gradient = QLinearGradient(0, 0, self.width(), self.height())
         gradient.setColorAt(0, QColor(59, 130, 246))  # 蓝色
@@ -157,6 +837,34 @@ class CustomSplashScreen(QSplashScreen):
         painter.setFont(title_font)
         painter.drawText(self.rect(), Qt.AlignCenter, self.app_title)
         
+        # 绘制设计者信息 - 在右下角
+        painter.setPen(QColor(255, 255, 255, 230))
+        designer_font = QFont("微软雅黑", 11, QFont.Bold)
+        painter.setFont(designer_font)
+        designer_rect = self.rect().adjusted(0, 0, -15, -15)
+        painter.drawText(designer_rect, Qt.AlignBottom | Qt.AlignRight, self.designer_info)
+        
+        # 添加版权信息在左下角
+        painter.setPen(QColor(255, 255, 255, 180))
+        copyright_font = QFont("微软雅黑", 9)
+        painter.setFont(copyright_font)
+        copyright_rect = self.rect().adjusted(15, 0, 0, -15)
+        painter.drawText(copyright_rect, Qt.AlignBottom | Qt.AlignLeft, "© 2025 记录管理系统 ver1.0.0")
+        
+        # 绘制logo
+        painter.setPen(QColor(255, 255, 255, 120))
+        icon_font = QFont("Arial", 48)
+        painter.setFont(icon_font)
+        painter.drawText(30, 80, "\U0001F4DD")  # 使用emoji图标
+        
+        painter.end()
+        return background
+    
+    def drawContents(self, painter):
+        """自定义绘制启动画面内容"""
+        # 绘制预先渲染好的静态部分
+        painter.drawPixmap(0, 0, self.background)
+        
         # 绘制加载文本 - 在标题下方
         painter.setPen(QColor(255, 255, 255, 200))  # 半透明白色
         info_font = QFont("微软雅黑", 12)
@@ -181,30 +889,24 @@ class CustomSplashScreen(QSplashScreen):
         # 绘制进度文本
         painter.setPen(Qt.white)
         painter.drawText(progress_rect, Qt.AlignCenter, f"{self.progress}%")
-        
-        # 绘制设计者信息 - 在右下角
-        painter.setPen(QColor(255, 255, 255, 230))
-        designer_font = QFont("微软雅黑", 11, QFont.Bold)
-        painter.setFont(designer_font)
-        designer_rect = self.rect().adjusted(0, 0, -15, -15)
-        painter.drawText(designer_rect, Qt.AlignBottom | Qt.AlignRight, self.designer_info)
-        
-        # 添加版权信息在左下角
-        painter.setPen(QColor(255, 255, 255, 180))
-        copyright_font = QFont("微软雅黑", 9)
-        painter.setFont(copyright_font)
-        copyright_rect = self.rect().adjusted(15, 0, 0, -15)
-        painter.drawText(copyright_rect, Qt.AlignBottom | Qt.AlignLeft, "© 2025 记录管理系统 ver1.0.0")
-        
-        # 绘制logo
-        painter.setPen(QColor(255, 255, 255, 120))
-        icon_font = QFont("Arial", 48)
-        painter.setFont(icon_font)
-        painter.drawText(30, 80, "\U0001F4DD")  # 使用emoji图标
 
     def setProgress(self, value):
-        """设置进度值（0-100）"""
+        """设置进度值（0-100），重绘频率最多约30帧/秒"""
         self.progress = value
+        now = time.monotonic()
+        # 起止进度总是立即显示，中间进度过于频繁时跳过重绘
+        if value in (0, 100) or now - self.last_repaint >= 0.033:
+            self.last_repaint = now
+            self.repaint()
+    
+    def set_step(self, message, value):
+        """显示初始化步骤及其进度
+        
+        启动步骤之间只相隔几毫秒，且数量很少，因此每一步都立即重绘，不受 setProgress 的限频影响。
+        """
+        self.loading_info = message
+        self.progress = value
+        self.last_repaint = time.monotonic()
         self.repaint()
 
 
@@ -255,19 +957,7 @@ class AddRecordDialog(QDialog):
         self.submit_button = QPushButton("添加")
         self.submit_button.setShortcut(QKeySequence(Qt.Key_Return))  # 回车键快捷方式
         self.submit_button.clicked.connect(self.validate_and_accept)
-        self.submit_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.submit_button.setObjectName("primaryButton")
         button_layout.addWidget(self.submit_button)
         
         # 弹簧使按钮居右
@@ -277,19 +967,7 @@ class AddRecordDialog(QDialog):
         self.cancel_button = QPushButton("取消")
         self.cancel_button.setShortcut(QKeySequence(Qt.Key_Escape))  # ESC键快捷方式
         self.cancel_button.clicked.connect(self.reject)
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        self.cancel_button.setObjectName("dangerButton")
         button_layout.addWidget(self.cancel_button)
         
         layout.addLayout(button_layout)
@@ -312,9 +990,7 @@ class AddRecordDialog(QDialog):
             return
         
         # 验证日期格式
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
+        if not is_valid_datetime(date_str):
             QMessageBox.warning(self, "日期格式错误", "日期格式应为：YYYY-MM-DD HH:MM:SS")
             self.date_input.selectAll()
             self.date_input.setFocus()
@@ -405,6 +1081,15 @@ class BatchAddDialog(QDialog):
         self.preview_list.setStyleSheet("background-color: #f5f5f5; border: 1px solid #ddd;")
         layout.addWidget(self.preview_list)
         
+        # 预览延迟刷新：停止输入150毫秒后才重新生成预览
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+        
+        # 名字列表缓存，文本未变化时无需重新拆分
+        self.cached_text = None
+        self.cached_names = []
+        
         # 连接文本变化事件
         self.text_input.textChanged.connect(self.update_preview)
         self.remark_input.textChanged.connect(self.update_preview)
@@ -416,19 +1101,7 @@ class BatchAddDialog(QDialog):
         self.add_button = QPushButton("批量添加")
         self.add_button.setShortcut(QKeySequence(Qt.CTRL + Qt.Key_Return))
         self.add_button.clicked.connect(self.validate_and_accept)
-        self.add_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.add_button.setObjectName("primaryButton")
         button_layout.addWidget(self.add_button)
         
         button_layout.addStretch()
@@ -437,26 +1110,14 @@ class BatchAddDialog(QDialog):
         cancel_button = QPushButton("取消")
         cancel_button.setShortcut(QKeySequence(Qt.Key_Escape))
         cancel_button.clicked.connect(self.reject)
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        cancel_button.setObjectName("dangerButton")
         button_layout.addWidget(cancel_button)
         
         layout.addLayout(button_layout)
         self.setLayout(layout)
         
         # 初始预览
-        self.update_preview()
+        self.refresh_preview()
     
     def on_time_option_changed(self):
         """时间选项改变时的处理"""
@@ -471,7 +1132,11 @@ class BatchAddDialog(QDialog):
         self.update_preview()
     
     def update_preview(self):
-        """更新预览"""
+        """请求更新预览（延迟执行，合并连续的输入）"""
+        self.preview_timer.start(150)
+    
+    def refresh_preview(self):
+        """重新生成预览"""
         names = self.get_names_list()
         remark = self.remark_input.text().strip() or None
         
@@ -499,12 +1164,15 @@ class BatchAddDialog(QDialog):
     def get_names_list(self):
         """获取名字列表"""
         text = self.text_input.toPlainText()
-        names = []
-        for line in text.split('\n'):
-            line = line.strip()
-            if line:  # 忽略空行
-                names.append(line)
-        return names
+        if text != self.cached_text:
+            names = []
+            for line in text.split('\n'):
+                line = line.strip()
+                if line:  # 忽略空行
+                    names.append(line)
+            self.cached_text = text
+            self.cached_names = names
+        return self.cached_names
     
     def validate_and_accept(self):
         """验证并接受"""
@@ -518,9 +1186,7 @@ class BatchAddDialog(QDialog):
         # 验证自定义时间格式
         if self.time_custom.isChecked():
             time_str = self.custom_time_input.text().strip()
-            try:
-                datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
+            if not is_valid_datetime(time_str):
                 QMessageBox.warning(self, "时间格式错误", "时间格式应为：YYYY-MM-DD HH:MM:SS")
                 self.custom_time_input.selectAll()
                 self.custom_time_input.setFocus()
@@ -540,11 +1206,17 @@ class BatchAddDialog(QDialog):
         
         # 生成记录列表，每个记录间隔1秒（避免完全相同的时间）
         records = []
-        for i, name in enumerate(names):
-            # 每条记录时间递增1秒
-            record_time = base_time + timedelta(seconds=i)
-            time_str = record_time.strftime("%Y-%m-%d %H:%M:%S")
-            records.append((name, time_str, remark))
+        minute_start = base_time
+        index = 0
+        while index < len(names):
+            # 同一分钟内只有秒数变化，每分钟只需格式化一次前缀
+            prefix = minute_start.strftime("%Y-%m-%d %H:%M:")
+            second = minute_start.second
+            count = min(60 - second, len(names) - index)
+            for offset in range(count):
+                records.append((names[index + offset], f"{prefix}{second + offset:02d}", remark))
+            index += count
+            minute_start += timedelta(seconds=count)
         
         return records
 
@@ -565,7 +1237,7 @@ class EditRecordDialog(QDialog):
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("请输入名称")
         if record:
-            self.name_input.setText(record[1])  # name
+            self.name_input.setText(record["name"])
         name_layout.addWidget(self.name_input)
         layout.addLayout(name_layout)
         
@@ -574,7 +1246,7 @@ class EditRecordDialog(QDialog):
         date_layout.addWidget(QLabel("添加时间*"))
         self.date_input = QLineEdit()
         if record:
-            self.date_input.setText(record[2])  # add_date
+            self.date_input.setText(record["add_date"])
         else:
             self.date_input.setText(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         date_layout.addWidget(self.date_input)
@@ -586,8 +1258,8 @@ class EditRecordDialog(QDialog):
         self.remark_input = QTextEdit()
         self.remark_input.setMaximumHeight(80)
         self.remark_input.setPlaceholderText("可选备注信息...")
-        if record and record[3]:
-            self.remark_input.setPlainText(record[3])  # remark
+        if record and record["remark"]:
+            self.remark_input.setPlainText(record["remark"])
         remark_layout.addWidget(self.remark_input)
         layout.addLayout(remark_layout)
         
@@ -598,19 +1270,7 @@ class EditRecordDialog(QDialog):
         self.save_button = QPushButton("保存")
         self.save_button.setShortcut(QKeySequence(Qt.Key_Return))
         self.save_button.clicked.connect(self.validate_and_accept)
-        self.save_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.save_button.setObjectName("primaryButton")
         button_layout.addWidget(self.save_button)
         
         button_layout.addStretch()
@@ -619,19 +1279,7 @@ class EditRecordDialog(QDialog):
         self.cancel_button = QPushButton("取消")
         self.cancel_button.setShortcut(QKeySequence(Qt.Key_Escape))
         self.cancel_button.clicked.connect(self.reject)
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        self.cancel_button.setObjectName("dangerButton")
         button_layout.addWidget(self.cancel_button)
         
         layout.addLayout(button_layout)
@@ -654,9 +1302,7 @@ class EditRecordDialog(QDialog):
             return
         
         # 验证日期格式
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
+        if not is_valid_datetime(date_str):
             QMessageBox.warning(self, "日期格式错误", "日期格式应为：YYYY-MM-DD HH:MM:SS")
             self.date_input.selectAll()
             self.date_input.setFocus()
@@ -671,18 +1317,35 @@ class EditRecordDialog(QDialog):
         return self.name, self.date, self.remark
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # 每次从数据库加载的记录条数
+    PAGE_SIZE = 500
+    
+    def __init__(self, progress_callback=None):
+        """progress_callback(message, percent) 用于在启动画面上报告初始化进度"""
         super().__init__()
+        report = progress_callback or (lambda message, percent: None)
         self.setWindowTitle("记录管理系统")
         self.setGeometry(100, 100, 900, 700)
         
         # 初始化数据库管理器
+        report("正在初始化数据库连接...", 10)
         self.db_manager = DatabaseManager()
         
+        # 后台数据库任务：保持引用直到完成；每次加载递增代数，用于丢弃过期结果
+        self.db_tasks = set()
+        self.load_generation = 0
+        self.query_cache = QueryCache()
+        self.db_worker = DatabaseWorker(self)
+        # 当前显示的结果如何取后续页：fetch_page(db, offset, limit)
+        self.fetch_page = DatabaseManager.get_records_page
+        self.db_list_cache = None  # ((目录, 目录修改时间), 排好序的.db文件名列表)
+        
         # 创建UI
+        report("正在准备用户界面...", 40)
         self.create_ui()
         
-        # 加载数据
+        # 加载数据（在后台线程中进行，窗口显示后再填充表格）
+        report("正在加载记录数据...", 80)
         self.load_records()
         
         # 添加一个定时器用于延迟搜索
@@ -743,9 +1406,15 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(select_layout)
         
         # 创建表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["选择", "ID", "名字", "添加日期", "备注"])
+        self.model = RecordsModel(self)
+        self.model.dataChanged.connect(self.update_selected_count)
+        # 滚动到底部时加载下一页记录
+        self.model.fetch_more_requested.connect(self.fetch_more_records)
+        self.model.sort_requested.connect(self.on_sort_requested)
+        
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(0, CheckBoxDelegate(self.table))
         
         # 获取水平表头
         header = self.table.horizontalHeader()
@@ -768,7 +1437,8 @@ class MainWindow(QMainWindow):
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.verticalHeader().setVisible(False)
         
-        # 启用排序功能
+        # 启用排序功能，默认按添加日期降序
+        header.setSortIndicator(3, Qt.DescendingOrder)
         self.table.setSortingEnabled(True)
         
         main_layout.addWidget(self.table)
@@ -779,54 +1449,18 @@ class MainWindow(QMainWindow):
         # 添加按钮
         add_single_btn = QPushButton("单条添加")
         add_single_btn.clicked.connect(self.add_single_record)
-        add_single_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        add_single_btn.setObjectName("primaryButton")
         button_layout.addWidget(add_single_btn)
         
         batch_add_btn = QPushButton("批量添加")
         batch_add_btn.clicked.connect(self.batch_add_records)
-        batch_add_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-        """)
+        batch_add_btn.setObjectName("infoButton")
         button_layout.addWidget(batch_add_btn)
         
         # 添加编辑按钮
         edit_btn = QPushButton("编辑记录")
         edit_btn.clicked.connect(self.edit_selected_record)
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #F57C00;
-            }
-        """)
+        edit_btn.setObjectName("warningButton")
         button_layout.addWidget(edit_btn)
     
         button_layout.addStretch()
@@ -834,19 +1468,7 @@ class MainWindow(QMainWindow):
         # 删除按钮
         delete_btn = QPushButton("删除选中")
         delete_btn.clicked.connect(self.delete_selected_records)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        delete_btn.setObjectName("dangerButton")
         button_layout.addWidget(delete_btn)
         
         main_layout.addLayout(button_layout)
@@ -884,19 +1506,7 @@ class MainWindow(QMainWindow):
         reload_data_btn.setToolTip("重新加载当前数据库中的所有记录")
         reload_data_btn.setShortcut(QKeySequence(Qt.Key_F5))  # F5快捷键
         reload_data_btn.clicked.connect(self.reload_data)
-        reload_data_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #17a2b8;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #138496;
-            }
-        """)
+        reload_data_btn.setObjectName("reloadButton")
         toolbar.addWidget(reload_data_btn)
         
         toolbar.addSeparator()
@@ -911,6 +1521,12 @@ class MainWindow(QMainWindow):
         open_db_btn.clicked.connect(self.open_database)
         toolbar.addWidget(open_db_btn)
         
+        # 导入数据库按钮
+        import_db_btn = QPushButton("导入数据库")
+        import_db_btn.setToolTip("把其他数据库中的记录导入当前数据库（跳过重复名字）")
+        import_db_btn.clicked.connect(self.import_database)
+        toolbar.addWidget(import_db_btn)
+        
         # 初始化数据库列表
         self.refresh_database_list()
 
@@ -921,9 +1537,7 @@ class MainWindow(QMainWindow):
         
         self.db_combo.clear()
         
-        # 获取当前目录下的所有.db文件
-        current_dir = os.getcwd()
-        db_files = [f for f in os.listdir(current_dir) if f.endswith('.db')]
+        db_files = self.list_database_files()
         
         if db_files:
             self.db_combo.addItems(db_files)
@@ -937,6 +1551,19 @@ class MainWindow(QMainWindow):
         
         # 重新连接信号
         self.db_combo.currentTextChanged.connect(self.on_database_changed)
+    
+    def list_database_files(self):
+        """获取当前目录下的所有.db文件，目录未变化时直接使用上次的结果"""
+        current_dir = os.getcwd()
+        # 目录中增删文件都会改变目录的修改时间
+        mtime = os.stat(current_dir).st_mtime_ns
+        if self.db_list_cache and self.db_list_cache[0] == (current_dir, mtime):
+            return self.db_list_cache[1]
+        
+        with os.scandir(current_dir) as entries:
+            db_files = sorted(entry.name for entry in entries if entry.name.endswith('.db'))
+        self.db_list_cache = ((current_dir, mtime), db_files)
+        return db_files
 
     def on_database_changed(self, db_name):
         """数据库选择改变时的处理"""
@@ -945,147 +1572,189 @@ class MainWindow(QMainWindow):
             if os.path.exists(db_path) and db_path != self.db_manager.db_path:
                 try:
                     # 先清空表格，确保没有旧数据残留
-                    self.table.clearContents()
-                    self.table.setRowCount(0)
+                    self.model.set_records([])
                     
                     # 切换数据库
                     self.db_manager.switch_database(db_path)
+                    self.query_cache.clear()
                     
                     # 重新加载数据
-                    self.load_records()
-                    self.update_status(f"已切换到数据库: {db_name}")
+                    self.load_records(
+                        on_loaded=lambda: self.update_status(f"已切换到数据库: {db_name}"))
                 except Exception as e:
                     QMessageBox.critical(self, "错误", f"切换数据库失败：{str(e)}")
                     self.refresh_database_list()  # 恢复列表
     
-    def load_records(self):
-        """加载并显示所有记录"""
-        # 先清空表格内容
-        self.table.clearContents()
-        self.table.setRowCount(0)
-        
-        # 获取记录
-        records = self.db_manager.get_all_records()
+    def run_db_task(self, func, on_finished, error_status):
+        """在线程池中执行数据库操作，完成后在GUI线程中调用 on_finished(result)
         
-        # 设置行数
-        self.table.setRowCount(len(records))
+        执行失败时弹出错误信息，并在状态栏显示 error_status。
+        """
+        task = DatabaseTask(self.db_worker, self.db_manager.db_path, func)
+        self.db_tasks.add(task)
         
-        for row, record in enumerate(records):
-            record_id, name, add_date, remark = record
-            
-            # 第0列：复选框
-            checkbox = QCheckBox()
-            checkbox.setStyleSheet("QCheckBox { margin-left: 15px; }")
-            checkbox.stateChanged.connect(self.update_selected_count)
-            self.table.setCellWidget(row, 0, checkbox)
-            
-            # 第1列：ID
-            id_item = QTableWidgetItem()
-            id_item.setData(Qt.DisplayRole, record_id)
-            self.table.setItem(row, 1, id_item)
-            
-            # 第2列：名字
-            self.table.setItem(row, 2, QTableWidgetItem(name))
-            
-            # 第3列：添加日期
-            date_item = QTableWidgetItem(add_date)
-            try:
-                date_obj = datetime.strptime(add_date, "%Y-%m-%d %H:%M:%S")
-                date_item.setData(Qt.UserRole, date_obj.timestamp())
-            except:
-                date_item.setData(Qt.UserRole, 0)
-            self.table.setItem(row, 3, date_item)
-            
-            # 第4列：备注
-            remark_text = remark if remark else ""
-            self.table.setItem(row, 4, QTableWidgetItem(remark_text))
-            
-            # 设置ID列不可编辑
-            self.table.item(row, 1).setFlags(self.table.item(row, 1).flags() & ~Qt.ItemIsEditable)
+        def finish(result):
+            self.db_tasks.discard(task)
+            on_finished(result)
         
-        # 默认按添加日期降序排序（最新的在前）
-        self.table.sortItems(3, Qt.DescendingOrder)
+        def fail(message):
+            self.db_tasks.discard(task)
+            QMessageBox.critical(self, "错误", f"数据库操作失败：{message}")
+            self.update_status(error_status)
         
-        # 更新状态栏和选中计数
-        self.update_status(f"共 {len(records)} 条记录")
-        self.update_selected_count()
+        task.signals.finished.connect(finish)
+        task.signals.error.connect(fail)
+        self.db_worker.start(task)
+    
+    def start_loading(self, keep_sort=False):
+        """开始新一轮加载，返回本轮的代数；keep_sort为False时恢复默认的添加日期降序"""
+        self.load_generation += 1
+        if not keep_sort:
+            self.model.sort_column = 3
+            self.model.sort_order = Qt.DescendingOrder
+            self.table.horizontalHeader().setSortIndicator(3, Qt.DescendingOrder)
+        # 加载完成前不再按滚动追加旧结果
+        self.model.has_more = False
+        self.update_status("正在加载...")
+        return self.load_generation
+    
+    def current_sort(self):
+        """当前排序方式对应的查询参数 (列, 是否降序)"""
+        return self.model.sort_column, self.model.sort_order == Qt.DescendingOrder
+    
+    def load_records(self, on_loaded=None, keep_sort=False):
+        """加载并显示所有记录（先加载第一页，滚动时再加载更多）"""
+        generation = self.start_loading(keep_sort)
+        page_size = self.PAGE_SIZE
+        sort = self.current_sort()
+        cache_key = (self.db_manager.db_path, "", sort)
+        cache_version = self.query_cache.version
+        
+        def query(db):
+            return db.get_records_page(0, page_size, *sort), db.count_records()
+        
+        def apply(result):
+            self.query_cache.put(cache_key, result, cache_version)
+            if generation != self.load_generation:
+                return  # 已有更新的加载请求
+            records, total = result
+            self.fetch_page = lambda db, offset, limit: db.get_records_page(offset, limit, *sort)
+            self.populate_table(records)
+            self.model.has_more = len(records) == page_size
+            
+            # 更新状态栏
+            self.update_status(f"共 {total} 条记录")
+            if on_loaded:
+                on_loaded()
+        
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            apply(cached)
+        else:
+            self.run_db_task(query, apply, "数据加载失败")
+    
+    def fetch_more_records(self):
+        """在后台加载当前结果（全部记录或搜索结果）的下一页并追加到表格末尾"""
+        generation = self.load_generation
+        fetch_page = self.fetch_page
+        offset = self.model.rowCount()
+        page_size = self.PAGE_SIZE
+        
+        def apply(records):
+            if generation != self.load_generation:
+                return  # 列表已重新加载或搜索条件已变化
+            self.populate_table(records, append=True)
+            self.model.has_more = len(records) == page_size
+        
+        self.run_db_task(lambda db: fetch_page(db, offset, page_size), apply, "数据加载失败")
     
-    def search_records(self, query):
-        """搜索记录"""
-        # 先清空表格内容
-        self.table.clearContents()
-        self.table.setRowCount(0)
+    def search_records(self, query, on_loaded=None, keep_sort=False):
+        """搜索记录（先加载第一页，滚动时再加载更多）"""
+        if not query.strip():
+            self.load_records(on_loaded, keep_sort)
+            return
         
-        if query.strip():
-            records = self.db_manager.search_records(query)
-            self.update_status(f"搜索到 {len(records)} 条记录")
+        generation = self.start_loading(keep_sort)
+        page_size = self.PAGE_SIZE
+        sort = self.current_sort()
+        cache_key = (self.db_manager.db_path, query, sort)
+        cache_version = self.query_cache.version
+        
+        def search(db):
+            # 优先使用可走索引的前缀搜索，无结果时再退回包含搜索
+            records = db.search_prefix(query, page_size, 0, *sort)
+            if records:
+                return "prefix", records, db.count_prefix(query)
+            return ("contains", db.search_contains(query, page_size, 0, *sort),
+                    db.count_contains(query))
+        
+        def apply(result):
+            self.query_cache.put(cache_key, result, cache_version)
+            if generation != self.load_generation:
+                return  # 用户已输入新的搜索内容
+            mode, records, total = result
+            if mode == "prefix":
+                self.fetch_page = lambda db, offset, limit: db.search_prefix(query, limit, offset, *sort)
+            else:
+                self.fetch_page = lambda db, offset, limit: db.search_contains(query, limit, offset, *sort)
+            self.populate_table(records)
+            self.model.has_more = len(records) == page_size
+            self.update_status(f"搜索到 {total} 条记录")
+            if on_loaded:
+                on_loaded()
+        
+        # 同样的查询在数据未变化时直接使用缓存结果，不再访问数据库
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            apply(cached)
         else:
-            records = self.db_manager.get_all_records()
-            self.update_status(f"共 {len(records)} 条记录")
+            self.run_db_task(search, apply, "搜索失败")
+    
+    def on_sort_requested(self, column, order):
+        """点击表头排序：按新的排序方式从头重新查询当前列表或搜索结果"""
+        if column not in DatabaseManager.SORT_FIELDS:
+            # 复选框列不能排序，恢复原来的排序标记
+            self.table.horizontalHeader().setSortIndicator(self.model.sort_column, self.model.sort_order)
+            return
         
-        # 设置行数
-        self.table.setRowCount(len(records))
+        # 重新查询后保留当前行和勾选状态
+        current_row = self.table.currentIndex().row()
+        current_id = self.model.records[current_row][0] if current_row >= 0 else None
+        checked_ids = self.model.checked_ids()
         
-        for row, record in enumerate(records):
-            record_id, name, add_date, remark = record
-            
-            # 第0列：复选框
-            checkbox = QCheckBox()
-            checkbox.setStyleSheet("QCheckBox { margin-left: 15px; }")
-            checkbox.stateChanged.connect(self.update_selected_count)
-            self.table.setCellWidget(row, 0, checkbox)
-            
-            # 第1列：ID
-            id_item = QTableWidgetItem()
-            id_item.setData(Qt.DisplayRole, record_id)
-            self.table.setItem(row, 1, id_item)
-            
-            # 第2列：名字
-            self.table.setItem(row, 2, QTableWidgetItem(name))
-            
-            # 第3列：添加日期
-            date_item = QTableWidgetItem(add_date)
-            try:
-                date_obj = datetime.strptime(add_date, "%Y-%m-%d %H:%M:%S")
-                date_item.setData(Qt.UserRole, date_obj.timestamp())
-            except:
-                date_item.setData(Qt.UserRole, 0)
-            self.table.setItem(row, 3, date_item)
-            
-            # 第4列：备注
-            remark_text = remark if remark else ""
-            self.table.setItem(row, 4, QTableWidgetItem(remark_text))
-            
-            # 设置ID列不可编辑
-            self.table.item(row, 1).setFlags(self.table.item(row, 1).flags() & ~Qt.ItemIsEditable)
+        def on_loaded():
+            if checked_ids:
+                self.model.set_checked_ids(checked_ids)
+            if current_id is not None:
+                self.restore_selection(current_id)
         
-        # 默认按添加日期降序排序
-        self.table.sortItems(3, Qt.DescendingOrder)
+        self.model.sort_column = column
+        self.model.sort_order = order
+        self.search_timer.stop()
+        self.search_records(self.search_input.text(), on_loaded, keep_sort=True)
+    
+    def populate_table(self, records, append=False):
+        """用给定记录填充表格，append为True时追加到现有行之后"""
+        if append:
+            self.model.append_records(records)
+        else:
+            # 查询结果已按当前的排序方式返回
+            self.model.set_records(records)
+            self.table.scrollToTop()
         
         self.update_selected_count()
-
     
     def edit_selected_record(self):
         """编辑选中的记录"""
         # 获取当前选中的行
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         if current_row < 0:
             QMessageBox.information(self, "提示", "请先选择要编辑的记录！")
             return
         
-        # 获取记录ID
-        id_item = self.table.item(current_row, 1)
-        if not id_item:
-            QMessageBox.warning(self, "错误", "无法获取记录ID！")
-            return
-        
-        record_id = int(id_item.text())
-        
-        # 获取记录详情
-        record = self.db_manager.get_record_by_id(record_id)
-        if not record:
-            QMessageBox.warning(self, "错误", "记录不存在！")
-            return
+        # 表格中的行已包含记录的全部字段，无需再查询数据库
+        record = self.model.records[current_row]
+        record_id = record["id"]
         
         # 创建编辑对话框
         dialog = EditRecordDialog(self, record)
@@ -1095,29 +1764,18 @@ class MainWindow(QMainWindow):
             
             if success:
                 QMessageBox.information(self, "成功", "记录更新成功！")
+                self.query_cache.clear()
                 self.load_records()
             else:
                 QMessageBox.critical(self, "错误", "更新记录失败！可能是名称重复。")
 
     def get_selected_record_ids(self):
         """获取选中的记录ID列表"""
-        selected_ids = []
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                id_item = self.table.item(row, 1)
-                if id_item:
-                    selected_ids.append(int(id_item.text()))
-        return selected_ids
+        return self.model.checked_ids()
     
     def get_selected_count(self):
         """获取选中的记录数量"""
-        count = 0
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                count += 1
-        return count
+        return self.model.checked_count()
     
     def update_selected_count(self):
         """更新选中数量显示"""
@@ -1125,18 +1783,26 @@ class MainWindow(QMainWindow):
         self.selected_count_label.setText(f"已选中: {count} 条")
     
     def select_all_records(self):
-        """全选所有记录"""
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(True)
+        """全选所有记录（包括当前列表或搜索结果中尚未加载的记录）"""
+        if not self.model.has_more:
+            self.model.set_all_checked(True)
+            return
+        
+        # 还有未加载的记录：在后台取出当前结果的全部ID
+        generation = self.load_generation
+        fetch_page = self.fetch_page
+        
+        def apply(all_ids):
+            if generation != self.load_generation:
+                return  # 列表已重新加载或搜索条件已变化
+            self.model.set_all_checked(True, all_ids)
+        
+        self.run_db_task(lambda db: [record[0] for record in fetch_page(db, 0, -1)], apply,
+                         "全选失败")
     
     def deselect_all_records(self):
         """取消全选所有记录"""
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(False)
+        self.model.set_all_checked(False)
     
     def delete_selected_records(self):
         """删除选中的记录"""
@@ -1158,6 +1824,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             success = self.db_manager.delete_records(selected_ids)
             if success:
+                self.query_cache.clear()
                 QMessageBox.information(self, "成功", f"已删除 {count} 条记录！")
                 self.load_records()
             else:
@@ -1171,6 +1838,7 @@ class MainWindow(QMainWindow):
             success, duplicate = self.db_manager.add_record(name, date, remark)
             
             if success:
+                self.query_cache.clear()
                 QMessageBox.information(self, "成功", "记录添加成功！")
                 self.load_records()
             else:
@@ -1189,38 +1857,34 @@ class MainWindow(QMainWindow):
         dialog = BatchAddDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             records = dialog.get_data()
+            self.update_status(f"正在添加 {len(records)} 条记录...")
+            self.run_db_task(lambda db: db.add_records_bulk(records), self.on_batch_added,
+                             "批量添加失败")
+    
+    def on_batch_added(self, result):
+        """批量添加完成后显示结果"""
+        success_count, failed_records = result
+        
+        # 显示结果
+        if success_count > 0:
+            self.query_cache.clear()
+            self.load_records()
+        
+        if failed_records:
+            failed_names = "、".join(failed_records[:999])
+            if len(failed_records) > 999:
+                failed_names += f" 等{len(failed_records)}个"
             
-            success_count = 0
-            failed_records = []
-            
-            for name, date, remark in records:
-                success, duplicate = self.db_manager.add_record(name, date, remark)
-                if success:
-                    success_count += 1
-                else:
-                    failed_records.append(name)
-            
-            # 显示结果
-            if success_count > 0:
-                self.load_records()
-            
-            if failed_records:
-                failed_names = "、".join(failed_records[:999])
-                if len(failed_records) > 999:
-                    failed_names += f" 等{len(failed_records)}个"
-                
-                msg = f"成功添加 {success_count} 条记录\n"
-                msg += f"失败 {len(failed_records)} 条记录（重复名字）：{failed_names}"
-                QMessageBox.warning(self, "批量添加结果", msg)
-            else:
-                QMessageBox.information(self, "成功", f"批量添加成功！共添加 {success_count} 条记录。")
+            msg = f"成功添加 {success_count} 条记录\n"
+            msg += f"失败 {len(failed_records)} 条记录（重复名字）：{failed_names}"
+            QMessageBox.warning(self, "批量添加结果", msg)
+        else:
+            QMessageBox.information(self, "成功", f"批量添加成功！共添加 {success_count} 条记录。")
     
     def on_search_changed(self, text):
         """搜索框文本变化时触发"""
-
-        # 重置定时器，300毫秒后执行搜索
-        self.search_timer.stop()
-        self.search_timer.start(100)
+        # 重新计时，停止输入300毫秒后才执行一次搜索
+        self.search_timer.start(300)
     
     def perform_search(self):
         """执行搜索"""
@@ -1230,6 +1894,8 @@ class MainWindow(QMainWindow):
     def clear_search(self):
         """清空搜索"""
         self.search_input.clear()
+        # 直接重新加载，无需再等待延迟搜索
+        self.search_timer.stop()
         self.load_records()
     
     def create_new_database(self):
@@ -1239,8 +1905,12 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
+            # 该文件可能在本次运行中打开过，先关闭缓存的连接再覆盖
+            self.db_manager.release(file_path)
+            self.db_worker.release(file_path)
             if DatabaseManager.create_new_database(file_path):
                 self.db_manager.switch_database(file_path)
+                self.query_cache.clear()
                 self.refresh_database_list()
                 self.load_records()
                 QMessageBox.information(self, "成功", f"数据库 '{os.path.basename(file_path)}' 创建成功！")
@@ -1256,18 +1926,41 @@ class MainWindow(QMainWindow):
         if file_path:
             try:
                 self.db_manager.switch_database(file_path)
+                self.query_cache.clear()
                 self.refresh_database_list()
                 self.load_records()
                 QMessageBox.information(self, "成功", f"数据库 '{os.path.basename(file_path)}' 打开成功！")
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"打开数据库失败：{str(e)}")
     
+    def import_database(self):
+        """导入其他数据库中的记录"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入数据库", "", "数据库文件 (*.db)"
+        )
+        
+        if file_path:
+            self.update_status(f"正在导入 {os.path.basename(file_path)}...")
+            self.run_db_task(lambda db: db.import_from(file_path), self.on_database_imported,
+                             "导入数据库失败")
+    
+    def on_database_imported(self, imported):
+        """导入完成后刷新列表并显示结果"""
+        if imported > 0:
+            self.query_cache.clear()
+            self.load_records()
+        else:
+            self.update_status("没有可导入的新记录")
+        QMessageBox.information(self, "导入完成", f"已导入 {imported} 条记录（重复名字已跳过）")
+    
     def update_status(self, message):
         """更新状态栏"""
         self.statusBar().showMessage(message)
     
     def closeEvent(self, event):
         """关闭事件"""
+        # 等待后台数据库任务结束后再关闭连接
+        self.db_worker.close()
         self.db_manager.close()
         event.accept()
         
@@ -1275,29 +1968,28 @@ class MainWindow(QMainWindow):
         """重新加载数据"""
         try:
             # 记录当前选中的记录ID（如果有的话）
-            current_row = self.table.currentRow()
+            current_row = self.table.currentIndex().row()
             selected_id = None
             if current_row >= 0:
-                id_item = self.table.item(current_row, 1)
-                if id_item:
-                    selected_id = int(id_item.text())
+                selected_id = self.model.records[current_row][0]
             
-            # 清空搜索框
-            self.search_input.clear()
+            # 丢弃缓存的查询结果，确保读到数据库的最新内容
+            self.query_cache.clear()
             
-            # 重新加载所有记录
-            self.load_records()
-            
-            # 尝试恢复之前选中的记录
-            if selected_id is not None:
-                self.restore_selection(selected_id)
+            # 清空搜索框（直接重新加载，无需再等待延迟搜索）
+            self.search_input.clear()
+            self.search_timer.stop()
             
-            # 显示成功消息
-            record_count = self.table.rowCount()
-            self.update_status(f"数据重新加载完成 - 共 {record_count} 条记录")
+            def on_loaded():
+                # 尝试恢复之前选中的记录
+                if selected_id is not None:
+                    self.restore_selection(selected_id)
+                
+                # 在状态栏显示临时消息
+                self.statusBar().showMessage("✓ 数据重新加载完成", 3000)  # 3秒后消失
             
-            # 在状态栏显示临时消息
-            self.statusBar().showMessage("✓ 数据重新加载完成", 3000)  # 3秒后消失
+            # 重新加载所有记录
+            self.load_records(on_loaded=on_loaded)
             
         except Exception as e:
             QMessageBox.critical(self, "错误", f"重新加载数据失败：{str(e)}")
@@ -1305,12 +1997,10 @@ class MainWindow(QMainWindow):
 
     def restore_selection(self, target_id):
         """恢复指定ID的记录选中状态"""
-        for row in range(self.table.rowCount()):
-            id_item = self.table.item(row, 1)
-            if id_item and int(id_item.text()) == target_id:
-                self.table.selectRow(row)
-                self.table.scrollToItem(id_item)
-                break
+        row = self.model.row_of(target_id)
+        if row is not None:
+            self.table.selectRow(row)
+            self.table.scrollTo(self.model.index(row, 1))
         
 
 # 主程序入口
@@ -1319,6 +2009,7 @@ if __name__ == "__main__":
     
     # 设置美观的样式
     app.setStyle(QStyleFactory.create("Fusion"))
+    app.setStyleSheet(BUTTON_STYLE_SHEET)
     
     # 设置应用程序图标
     if os.path.exists("logo.ico"):
@@ -1333,41 +2024,9 @@ if __name__ == "__main__":
     splash.show()
     app.processEvents()
     
-    # 初始化过程的各个步骤
-    initialization_steps = [
-        "正在加载系统组件...",
-        "正在初始化数据库连接...",
-        "正在准备用户界面...",
-        "正在加载记录数据...",
-        "即将完成..."
-    ]
-    
-    # 创建主窗口但不显示
-    window = MainWindow()
-    
-    # 显示实际的初始化进度
-    total_steps = len(initialization_steps)
-    for i, step_message in enumerate(initialization_steps):
-        # 计算进度百分比
-        progress = int((i / total_steps) * 100)
-        
-        # 更新启动画面上的消息和进度
-        splash.loading_info = step_message
-        splash.setProgress(progress)
-        
-        # 处理事件，确保界面更新
-        app.processEvents()
-        
-        # 执行实际的初始化任务...
-        
-        # 如果有必要，添加很小的延迟确保用户能看到进度
-        time.sleep(0.1)
-    
-    # 设置100%进度
-    splash.setProgress(100)
-    splash.loading_info = "加载完成！"
-    app.processEvents()
-    time.sleep(0.2)  # 短暂显示完成状态
+    # 创建主窗口但不显示，启动画面随实际的初始化步骤更新进度
+    window = MainWindow(progress_callback=splash.set_step)
+    splash.set_step("加载完成！", 100)
     
     # 关闭启动画面并显示主窗口
     splash.finish(window)